@@ -1,10 +1,26 @@
-from flask import Flask, request, jsonify, render_template
-import requests
-import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.templating import Jinja2Templates
+import aiohttp
+import asyncio
 import time
 import os
+from config import MCP_CRAWL_TIMEOUT_SECONDS
 
-app = Flask(__name__, template_folder="templates")
+HTTP = {"session": None}
+CRAWL_TASKS = set()
+
+@asynccontextmanager
+async def lifespan(app):
+    # One pooled client session for every outbound call this agent makes
+    HTTP["session"] = aiohttp.ClientSession()
+    yield
+    for task in CRAWL_TASKS:
+        task.cancel()
+    await HTTP["session"].close()
+
+app = FastAPI(lifespan=lifespan)
+templates = Jinja2Templates(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
 
 AGENT_STATE = {
     "last_crawl": None,
@@ -12,7 +28,9 @@ AGENT_STATE = {
     "suggestions": None,
     "last_target": None,
     "last_interval": None,
-    "last_max_concurrent": None
+    "last_max_concurrent": None,
+    "analysis": None,
+    "code_matches": None
 }
 
 RESULTS_DIR = os.path.abspath("results")
@@ -21,6 +39,10 @@ ALLOWED_EXTENSIONS = (".json", ".csv", ".md")
 MCP_SERVER_URL = "http://localhost:8080/invoke"
 MCP_HEALTH_URL = "http://localhost:8080/describe"
 MCP_FILE_URL = "http://localhost:8080/files"
+# A full crawl can take a long time; don't give up on one the server will still cache
+MCP_CRAWL_TIMEOUT = aiohttp.ClientTimeout(total=MCP_CRAWL_TIMEOUT_SECONDS)
+ANALYZER_URL = os.getenv("ANALYZER_URL", "http://localhost:9100/v1/message:send")
+GITHUB_AGENT_URL = os.getenv("GITHUB_AGENT_URL", "http://localhost:9200/v1/message:send")
 
 AGENT_CARD = {
     "protocolVersion": "0.3.0",
@@ -58,7 +80,7 @@ def list_result_files():
                 files.append(fname)
     return sorted(files)
 
-def call_mcp_crawl(target_url, max_concurrent=10, output_prefix="a2a_mcp", output_format="json"):
+async def call_mcp_crawl(target_url, max_concurrent=10, output_prefix="a2a_mcp", output_format="json"):
     payload = {
         "target_url": target_url,
         "max_concurrent": max_concurrent,
@@ -66,25 +88,40 @@ def call_mcp_crawl(target_url, max_concurrent=10, output_prefix="a2a_mcp", outpu
         "output_prefix": output_prefix
     }
     try:
-        resp = requests.post(MCP_SERVER_URL, json=payload, timeout=180)
-        if resp.ok:
-            return resp.json()
-        else:
+        async with HTTP["session"].post(MCP_SERVER_URL, json=payload, timeout=MCP_CRAWL_TIMEOUT) as resp:
+            if resp.ok:
+                return await resp.json()
             return {
                 "http_200": [],
                 "http_non200": [],
-                "mcp_error": f"Status {resp.status_code}: {resp.text}"
+                "mcp_error": f"Status {resp.status}: {await resp.text()}"
             }
     except Exception as e:
         return {"http_200": [], "http_non200": [], "mcp_error": str(e)}
 
-def mcp_health():
+async def mcp_health():
     try:
-        r = requests.get(MCP_HEALTH_URL, timeout=3)
-        return r.ok
+        async with HTTP["session"].get(MCP_HEALTH_URL, timeout=aiohttp.ClientTimeout(total=3)) as r:
+            return r.ok
     except Exception:
         return False
 
+async def call_agent(url, skill, **params):
+    payload = {
+        "jsonrpc": "2.0",
+        "id": f"{skill}-{int(time.time())}",
+        "method": "message/send",
+        "params": dict(params, skill=skill)
+    }
+    try:
+        async with HTTP["session"].post(url, json=payload, timeout=aiohttp.ClientTimeout(total=180)) as resp:
+            body = await resp.json()
+        if "error" in body:
+            return {"error": body["error"].get("message")}
+        return body.get("result")
+    except Exception as e:
+        return {"error": str(e)}
+
 def generate_suggestions(non200):
     sugg = []
     for item in non200:
@@ -98,44 +135,63 @@ def generate_suggestions(non200):
             sugg.append(f"Review non-200 status {status}: {uri}")
     return sugg
 
-def periodic_crawl(interval, target_url, max_concurrent):
+async def crawl_pipeline(target_url, max_concurrent):
+    result = await call_mcp_crawl(target_url, max_concurrent)
+    non200 = result.get("http_non200", [])
+    AGENT_STATE["last_crawl"] = result
+    AGENT_STATE["last_timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    AGENT_STATE["suggestions"] = generate_suggestions(non200)
+    AGENT_STATE["last_target"] = target_url
+    AGENT_STATE["last_max_concurrent"] = max_concurrent
+    if non200:
+        # Analysis and source lookup both only need the crawl, so run them side by side
+        failing_urls = [item["uri"] for item in non200]
+        # Only failures go to the LLM; the full crawl won't fit in its context
+        failure_report = {
+            "http_non200": non200,
+            "external": [item for item in result.get("external", []) if item.get("status") != 200]
+        }
+        analysis, code_matches = await asyncio.gather(
+            call_agent(ANALYZER_URL, "analyze_crawl", crawl_report=failure_report),
+            call_agent(GITHUB_AGENT_URL, "discover_fix", failing_urls=failing_urls)
+        )
+    else:
+        analysis, code_matches = None, None
+    AGENT_STATE["analysis"] = analysis
+    AGENT_STATE["code_matches"] = code_matches
+
+async def periodic_crawl(interval, target_url, max_concurrent):
     while True:
-        result = call_mcp_crawl(target_url, max_concurrent)
-        AGENT_STATE["last_crawl"] = result
-        AGENT_STATE["last_timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
-        AGENT_STATE["suggestions"] = generate_suggestions(result.get("http_non200", []))
-        AGENT_STATE["last_target"] = target_url
+        await crawl_pipeline(target_url, max_concurrent)
         AGENT_STATE["last_interval"] = interval
-        AGENT_STATE["last_max_concurrent"] = max_concurrent
         print(f"[Agent] Periodic crawl complete at {AGENT_STATE['last_timestamp']}.")
-        time.sleep(interval)
+        await asyncio.sleep(interval)
 
-@app.route("/")
-def dashboard():
+@app.get("/")
+async def dashboard(request: Request):
     result_files = list_result_files()
     file_links = [
         {"name": fname, "url": f"{MCP_FILE_URL}/{fname}"}
         for fname in result_files
     ]
-    return render_template(
-        "dashboard.html",
-        last_target=AGENT_STATE.get("last_target"),
-        last_interval=AGENT_STATE.get("last_interval"),
-        last_max_concurrent=AGENT_STATE.get("last_max_concurrent"),
-        last_timestamp=AGENT_STATE.get("last_timestamp"),
-        crawl=AGENT_STATE.get("last_crawl"),
-        suggestions=AGENT_STATE.get("suggestions"),
-        mcp_ok=mcp_health(),
-        file_links=file_links
-    )
-
-@app.route("/.well-known/agent-card.json")
+    return templates.TemplateResponse(request, "dashboard.html", {
+        "last_target": AGENT_STATE.get("last_target"),
+        "last_interval": AGENT_STATE.get("last_interval"),
+        "last_max_concurrent": AGENT_STATE.get("last_max_concurrent"),
+        "last_timestamp": AGENT_STATE.get("last_timestamp"),
+        "crawl": AGENT_STATE.get("last_crawl"),
+        "suggestions": AGENT_STATE.get("suggestions"),
+        "mcp_ok": await mcp_health(),
+        "file_links": file_links
+    })
+
+@app.get("/.well-known/agent-card.json")
 def agent_card():
-    return jsonify(AGENT_CARD)
+    return AGENT_CARD
 
-@app.route("/v1/message:send", methods=["POST"])
-def message_send():
-    req = request.json
+@app.post("/v1/message:send")
+async def message_send(request: Request):
+    req = await request.json()
     jsonrpc_version = req.get("jsonrpc")
     method = req.get("method")
     params = req.get("params", {})
@@ -149,13 +205,17 @@ def message_send():
             AGENT_STATE["last_target"] = target_url
             AGENT_STATE["last_interval"] = interval
             AGENT_STATE["last_max_concurrent"] = max_conc
-            threading.Thread(target=periodic_crawl, args=(interval, target_url, max_conc), daemon=True).start()
+            task = asyncio.create_task(periodic_crawl(interval, target_url, max_conc))
+            CRAWL_TASKS.add(task)
+            task.add_done_callback(CRAWL_TASKS.discard)
             result = {"message": f"Periodic crawl started for {target_url}"}
         elif skill == "get_last_report":
             result = {
                 "timestamp": AGENT_STATE.get("last_timestamp"),
                 "last_crawl": AGENT_STATE.get("last_crawl"),
-                "suggestions": AGENT_STATE.get("suggestions")
+                "suggestions": AGENT_STATE.get("suggestions"),
+                "analysis": AGENT_STATE.get("analysis"),
+                "code_matches": AGENT_STATE.get("code_matches")
             }
         else:
             raise Exception(f"Unknown skill: {skill}")
@@ -165,7 +225,8 @@ def message_send():
             "jsonrpc": jsonrpc_version, "id": req_id,
             "error": {"code": -32000, "message": str(e)}
         }
-    return jsonify(resp)
+    return resp
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=9000)
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=9000)
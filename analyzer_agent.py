@@ -1,9 +1,10 @@
-from flask import Flask, request, jsonify
+from fastapi import FastAPI, Request
+import asyncio
 import openai
 import os
 import logging
 
-app = Flask(__name__)
+app = FastAPI()
 
 openai.api_key = os.getenv("OPENAI_API_KEY")
 MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
@@ -23,13 +24,13 @@ AGENT_CARD = {
     ]
 }
 
-@app.route("/.well-known/agent-card.json")
+@app.get("/.well-known/agent-card.json")
 def agent_card():
-    return jsonify(AGENT_CARD)
+    return AGENT_CARD
 
-@app.route("/v1/message:send", methods=["POST"])
-def message_send():
-    req = request.json
+@app.post("/v1/message:send")
+async def message_send(request: Request):
+    req = await request.json()
     params = req.get("params", {})
     skill = params.get("skill")
     if skill == "analyze_crawl":
@@ -41,29 +42,32 @@ def message_send():
             f"\nCrawl Report:\n{report}"
         )
         try:
-            llm_resp = openai.ChatCompletion.create(
+            # The openai client is blocking; keep it off the event loop
+            llm_resp = await asyncio.to_thread(
+                openai.ChatCompletion.create,
                 model=MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=512
             )
             analysis = llm_resp['choices'][0]['message']['content']
-            return jsonify({
+            return {
                 "jsonrpc": req.get("jsonrpc", "2.0"),
                 "id": req.get("id"),
                 "result": {"analysis": analysis}
-            })
+            }
         except Exception as e:
             logging.error(f"LLM error: {e}")
-            return jsonify({
+            return {
                 "jsonrpc": req.get("jsonrpc", "2.0"),
                 "id": req.get("id"),
                 "error": {"code": -32000, "message": str(e)}
-            })
-    return jsonify({
+            }
+    return {
         "jsonrpc": req.get("jsonrpc", "2.0"),
         "id": req.get("id"),
         "error": {"code": -32000, "message": "Unknown skill"}
-    })
+    }
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=9100)
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=9100)
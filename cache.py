@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+class ResultCache:
+    """Disk-backed crawl result cache with TTL, LRU eviction and single-flight.
+
+    Entries are keyed by the crawl parameters, so every client asking for the
+    same target shares one result. Concurrent misses for the same key wait on
+    the crawl already in progress instead of starting another one.
+    """
+
+    def __init__(self, cache_dir, ttl=600, max_entries=64):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._index = OrderedDict()  # key -> stored_at, least recently used first
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(params):
+        raw = json.dumps(params, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self):
+        # File mtimes record the last access, which restores LRU order on restart
+        entries = []
+        for fname in os.listdir(self.cache_dir):
+            if not fname.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, fname)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    stored_at = json.load(f)["stored_at"]
+            except (OSError, ValueError, KeyError):
+                continue
+            entries.append((os.path.getmtime(path), fname[:-len(".json")], stored_at))
+        for _, key, stored_at in sorted(entries):
+            self._index[key] = stored_at
+
+    def _get(self, key):
+        stored_at = self._index.get(key)
+        if stored_at is None:
+            return None
+        if time.time() - stored_at > self.ttl:
+            self._drop(key)
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(self._path(key))
+        except (OSError, ValueError):
+            self._index.pop(key, None)
+            return None
+        self._index.move_to_end(key)
+        return entry["result"]
+
+    def _put(self, key, params, result):
+        entry = {"stored_at": time.time(), "params": params, "result": result}
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(key))
+        self._index[key] = entry["stored_at"]
+        self._index.move_to_end(key)
+        while len(self._index) > self.max_entries:
+            self._drop(next(iter(self._index)))
+
+    def _drop(self, key):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get(self, params):
+        with self._lock:
+            return self._get(self.make_key(params))
+
+    def get_or_compute(self, params, compute):
+        """Return (result, cached) for params, running compute() at most once per key."""
+        key = self.make_key(params)
+        with self._lock:
+            result = self._get(key)
+            if result is not None:
+                return result, True
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            return future.result(), True
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        # Release waiters before touching the disk so a failed write can't strand them
+        future.set_result(result)
+        try:
+            with self._lock:
+                self._put(key, params, result)
+        except (OSError, TypeError, ValueError) as e:
+            logging.warning(f"Could not cache crawl result: {e!r}")
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return result, False
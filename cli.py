@@ -1,26 +1,77 @@
 import click
 import asyncio
+import os
+from urllib.parse import urlparse
 from config import get_config
 from crawl import crawl_site
-from report import split_by_status, report_output
+from report import split_by_status, report_output, external_report_output, recheck_output, find_reports, read_records
+from sitemap import export_sitemap
+
+def parse_path_weights(ctx, param, values):
+    weights = {}
+    for value in values:
+        prefix, _, weight = value.rpartition("=")
+        try:
+            if not prefix.startswith("/"):
+                raise ValueError
+            weights[prefix] = float(weight)
+        except ValueError:
+            raise click.BadParameter(f"expected /PATH=WEIGHT, got {value!r}")
+    return weights
 
 @click.command()
 @click.option("--target-url", help="Target website to crawl", required=True)
 @click.option("--max-concurrent", default=10, type=int, show_default=True, help="Max concurrent requests")
 @click.option("--output-format", type=click.Choice(['csv', 'json']), default='csv', show_default=True, help="Result file format (csv or json)")
 @click.option("--output-prefix", default="crawler_report", show_default=True, help="Prefix for output files")
-def run(target_url, max_concurrent, output_format, output_prefix):
+@click.option("--check-external/--no-check-external", default=False, show_default=True, help="Also check each unique external link once")
+@click.option("--external-max-concurrent", default=20, type=int, show_default=True, help="Max concurrent external link checks")
+@click.option("--external-per-host", default=2, type=int, show_default=True, help="Max concurrent external link checks per host")
+@click.option("--sitemap-format", type=click.Choice(['md', 'graphml', 'dot']), default=None, help="Also export the link graph as a sitemap (md, graphml or dot)")
+@click.option("--max-pages", type=int, default=None, help="Stop after this many pages and write partial reports")
+@click.option("--time-budget", type=float, default=None, help="Stop scheduling new pages after this many seconds and write partial reports")
+@click.option("--path-weight", "path_weights", multiple=True, callback=parse_path_weights, help="Crawl pages under /PATH earlier, e.g. /docs=2 (repeatable)")
+@click.option("--previous-report", default=None, help="Non-200 report whose URLs are rechecked first [default: this prefix's last non-200 report]")
+def run(target_url, max_concurrent, output_format, output_prefix, check_external, external_max_concurrent, external_per_host, sitemap_format,
+        max_pages, time_budget, path_weights, previous_report):
+    if previous_report is None:
+        previous_reports = find_reports(output_prefix, "http_non200")[:1]
+    else:
+        previous_reports = [previous_report] if os.path.isfile(previous_report) else []
+    # Failures a budgeted run didn't get to are carried over in the recheck file
+    previous_failures = {}
+    for path in find_reports(output_prefix, "recheck") + previous_reports:
+        previous_failures.update((record["uri"], record) for record in read_records(path))
+    failed_urls = list(previous_failures)
     cli_args = {
         "target_url": target_url,
-        "max_concurrent": max_concurrent
+        "max_concurrent": max_concurrent,
+        "check_external": check_external,
+        "external_max_concurrent": external_max_concurrent,
+        "external_per_host": external_per_host,
+        "max_pages": max_pages,
+        "time_budget": time_budget,
+        "path_weights": path_weights,
+        "failed_urls": failed_urls
     }
     config = get_config(cli_args)
     click.secho(f"Website Target: {config['target_url']}", fg="yellow", bold=True)
     loop = asyncio.get_event_loop()
-    status_dict, link_graph = loop.run_until_complete(crawl_site(config, click.secho))
+    status_dict, link_graph, external_status, unlinked_status = loop.run_until_complete(crawl_site(config, click.secho))
     http200, non200 = split_by_status(status_dict)
     # Write .csv/.json as requested
     report_output(http200, non200, output_format, output_prefix, click.secho)
+    domain = urlparse(config["target_url"]).netloc
+    unchecked = [record for uri, record in previous_failures.items()
+                 if uri not in status_dict and uri not in unlinked_status and urlparse(uri).netloc == domain]
+    recheck_output(unchecked, output_format, output_prefix, click.secho)
+    if config["check_external"]:
+        external_report_output(external_status, output_format, output_prefix, click.secho)
+    if sitemap_format:
+        sitemap_path = f"{output_prefix}_sitemap.{sitemap_format}"
+        stats = export_sitemap(link_graph, config["target_url"], sitemap_format, sitemap_path)
+        click.secho(f"Sitemap: {sitemap_path} ({len(stats['depth'])} reachable, "
+                    f"{len(stats['orphans'])} orphan, {len(stats['unreachable'])} unreachable)", fg="green")
     click.secho("Done.", fg="magenta", bold=True)
 
 if __name__ == "__main__":
@@ -1,6 +1,16 @@
+# How long agents wait on the MCP /invoke endpoint; it covers a full crawl
+MCP_CRAWL_TIMEOUT_SECONDS = 3600
+
 CONFIG_DEFAULTS = {
     "target_url": "https://nebius.com/",
     "max_concurrent": 10,
+    "check_external": False,
+    "external_max_concurrent": 20,
+    "external_per_host": 2,
+    "max_pages": None,
+    "time_budget": None,
+    "path_weights": {},
+    "failed_urls": [],
     "crawler_report_md": "crawler_report.md",
     "crawler_report_csv": "crawler_report.csv",
     "sitemap_report_md": "sitemap_report.md"
@@ -1,58 +1,185 @@
-import asyncio, aiohttp, re, networkx
+import asyncio, aiohttp, heapq, itertools, math, re, networkx
 from urllib.parse import urljoin, urlparse
 
-async def get_links_from_html(html, base_url, visited, domain):
+async def get_links_from_html(html, base_url, domain, external=None):
     links = set()
     for match in re.findall(r'<a\s[^>]*href=["\'](.*?)["\']', html, re.IGNORECASE):
         href = match.strip()
         full_url = urljoin(base_url, href.split('#')[0])
         parsed = urlparse(full_url)
-        if parsed.netloc == domain and full_url not in visited:
+        if parsed.netloc == domain:
             links.add(full_url)
+        elif external is not None and parsed.scheme in ("http", "https"):
+            external.add(full_url)
     return list(links)
 
-async def fetch(session, url, visited, domain):
+async def fetch(session, url, domain, external=None):
     try:
         async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
             status = response.status
             if status != 200:
                 return url, status, []
             html = await response.text()
-            links = await get_links_from_html(html, url, visited, domain)
+            links = await get_links_from_html(html, url, domain, external)
             return url, status, links
     except Exception as e:
         return url, f"Error: {e}", []
 
+async def check_external(session, url):
+    # HEAD first; fall back to GET for servers that reject or mishandle HEAD
+    timeout = aiohttp.ClientTimeout(total=10)
+    try:
+        async with session.head(url, timeout=timeout, allow_redirects=True) as response:
+            status = response.status
+        if status in (403, 405, 501):
+            async with session.get(url, timeout=timeout) as response:
+                status = response.status
+        return url, status
+    except Exception as e:
+        # repr() keeps the exception type, so timeouts aren't reported as a bare "Error: "
+        return url, f"Error: {e!r}"
+
+def make_priority(failed_urls=(), path_weights=None):
+    # Lower keys are fetched first: last run's failures, then weighted/shallow
+    # pages, then pages with more inbound links seen so far.
+    failed_urls = set(failed_urls)
+    weights = sorted((path_weights or {}).items(), key=lambda kv: len(kv[0]), reverse=True)
+    def priority(url, depth, in_degree):
+        path = urlparse(url).path or "/"
+        weight = next((w for prefix, w in weights if path.startswith(prefix)), 0)
+        return (0 if url in failed_urls else 1, depth - weight, -in_degree)
+    return priority
+
+class Frontier:
+    """Priority queue of URLs still to crawl, keyed by priority(url, depth, in_degree)."""
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.depth, self.in_degree = {}, {}
+        self._heap, self._key, self._done = [], {}, set()
+        self._seq = itertools.count()
+
+    def push(self, url, depth, linked=True):
+        self.depth[url] = min(depth, self.depth.get(url, depth))
+        if url in self._done:
+            return
+        if linked:
+            self.in_degree[url] = self.in_degree.get(url, 0) + 1
+        key = self.priority(url, self.depth[url], self.in_degree.get(url, 0))
+        if key != self._key.get(url):
+            # Stale heap entries for this URL are skipped in pop()
+            self._key[url] = key
+            heapq.heappush(self._heap, (key, next(self._seq), url))
+
+    def pop(self):
+        while self._heap:
+            key, _, url = heapq.heappop(self._heap)
+            if url not in self._done and self._key.get(url) == key:
+                self._done.add(url)
+                del self._key[url]
+                return url
+        raise IndexError("pop from empty frontier")
+
+    def __len__(self):
+        return len(self._key)
+
 async def crawl_site(config, click_echo):
     target_url = config["target_url"]
     domain = urlparse(target_url).netloc
     max_concurrent = config["max_concurrent"]
-    visited, to_visit = set(), set([target_url])
-    status_dict, link_graph = {}, networkx.DiGraph()
-    sem = asyncio.Semaphore(max_concurrent)
+    max_pages, time_budget = config.get("max_pages"), config.get("time_budget")
+    status_dict, out_links, link_graph = {}, {}, networkx.DiGraph()
+    external_status, external_seen, external_tasks = {}, set(), {}
+    check_external_links = config.get("check_external", False)
+    failed_urls = [u for u in config.get("failed_urls", ()) if urlparse(u).netloc == domain]
+    priority = config.get("priority") or make_priority(failed_urls, config.get("path_weights"))
+    frontier = Frontier(priority)
+    frontier.push(target_url, 0, linked=False)
+    # Failures sort first on their own; their depth stays unknown until a real link is found
+    for url in failed_urls:
+        frontier.push(url, math.inf, linked=False)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + time_budget if time_budget else None
     click_echo(f"[INFO] Beginning crawl: {target_url}", fg="green")
-    async with aiohttp.ClientSession() as session:
+    if failed_urls:
+        click_echo(f"[INFO] Rechecking {len(failed_urls)} failures from the last run first.", fg="blue")
+    # External checks get their own bounded, per-host-limited pool so slow
+    # third-party hosts never hold connections the internal crawl needs.
+    # The limits are enforced with semaphores before a request starts, so the
+    # per-request timeout never includes time spent queueing for a connection.
+    external_sem = asyncio.Semaphore(config["external_max_concurrent"])
+    external_host_sems = {}
+    external_connector = aiohttp.TCPConnector(limit=config["external_max_concurrent"])
+    async with aiohttp.ClientSession() as session, \
+            aiohttp.ClientSession(connector=external_connector) as external_session:
+        async def external_worker(url):
+            host = urlparse(url).netloc
+            if host not in external_host_sems:
+                external_host_sems[host] = asyncio.Semaphore(config["external_per_host"])
+            # Take the host slot first so tasks queued on one busy host don't
+            # hold global slots other hosts could use.
+            async with external_host_sems[host], external_sem:
+                url, status = await check_external(external_session, url)
+            external_status[url] = status
         async def worker(url):
-            async with sem:
-                if url in visited:
-                    return []
-                visited.add(url)
-                url, status, links = await fetch(session, url, visited, domain)
-                status_dict[url] = status
-                link_graph.add_node(url)
+            external = set() if check_external_links else None
+            url, status, links = await fetch(session, url, domain, external)
+            status_dict[url] = status
+            out_links[url] = links
+            for link in external or ():
+                # Each unique external URL is checked once per crawl
+                if link not in external_seen:
+                    external_seen.add(link)
+                    external_tasks[asyncio.create_task(external_worker(link))] = link
+            return url, links
+        def out_of_budget():
+            if max_pages is not None and len(status_dict) + len(in_flight) >= max_pages:
+                return True
+            return deadline is not None and loop.time() >= deadline
+        in_flight, stopped_early = set(), False
+        while True:
+            while frontier and len(in_flight) < max_concurrent:
+                if out_of_budget():
+                    stopped_early = True
+                    break
+                in_flight.add(asyncio.create_task(worker(frontier.pop())))
+            if not in_flight:
+                break
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                url, links = task.result()
                 for link in links:
-                    link_graph.add_edge(url, link)
-                return links
-        queue = set([target_url])
-        while queue:
-            tasks = [worker(url) for url in queue]
-            queue.clear()
-            results = await asyncio.gather(*tasks)
-            for linklist in results:
-                for link in linklist:
-                    if link not in visited and link not in to_visit:
-                        to_visit.add(link)
-                        queue.add(link)
-            click_echo(f"[INFO] Progress: {len(visited)} visited, {len(queue)} queued.", fg="blue")
-    click_echo(f"[INFO] Done. {len(visited)} pages visited.", fg="green")
-    return status_dict, link_graph
+                    frontier.push(link, frontier.depth[url] + 1)
+                if len(status_dict) % 50 == 0:
+                    click_echo(f"[INFO] Progress: {len(status_dict)} visited, {len(frontier)} queued.", fg="blue")
+        if external_tasks:
+            click_echo(f"[INFO] Waiting on {len(external_tasks)} external link checks.", fg="blue")
+            remaining = max(deadline - loop.time(), 0) if deadline is not None else None
+            _, pending = await asyncio.wait(external_tasks, timeout=remaining)
+            for task in pending:
+                task.cancel()
+                # Keep budget-skipped links in the report so it doesn't look complete
+                external_status[external_tasks[task]] = "Error: not checked (time budget)"
+            await asyncio.gather(*pending, return_exceptions=True)
+            if pending:
+                click_echo(f"[WARN] Budget reached with {len(pending)} external links unchecked; reports are partial.", fg="yellow")
+    # Last run's failures only count as part of this crawl if a crawled page
+    # still links to them; the rest were rechecked but are returned separately.
+    # A crawl cut short by its budget can't tell, so it keeps reporting them.
+    seeded = set(failed_urls) - {target_url} if not stopped_early else set()
+    linked = {link for url, links in out_links.items() for link in links if link != url}
+    unlinked_status = {url: status_dict.pop(url) for url in seeded - linked if url in status_dict}
+    for url, links in out_links.items():
+        if url in unlinked_status:
+            continue
+        link_graph.add_node(url)
+        for link in links:
+            link_graph.add_edge(url, link)
+    if stopped_early:
+        click_echo(f"[WARN] Budget reached with {len(frontier)} pages unvisited; reports are partial.", fg="yellow")
+    if unlinked_status:
+        click_echo(f"[INFO] {len(unlinked_status)} previous failures are no longer linked; left out of this report.", fg="blue")
+    click_echo(f"[INFO] Done. {len(status_dict)} pages visited.", fg="green")
+    if check_external_links:
+        click_echo(f"[INFO] {len(external_status)} unique external links recorded.", fg="green")
+    return status_dict, link_graph, external_status, unlinked_status
@@ -1,9 +1,21 @@
-from flask import Flask, request, jsonify
-import requests
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+import aiohttp
+import asyncio
 import os
 import logging
 
-app = Flask(__name__)
+HTTP = {"session": None}
+# GitHub's code search API is rate limited, so bound lookups per request
+SEARCH_CONCURRENCY = int(os.getenv("GITHUB_SEARCH_CONCURRENCY", "4"))
+
+@asynccontextmanager
+async def lifespan(app):
+    HTTP["session"] = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+    yield
+    await HTTP["session"].close()
+
+app = FastAPI(lifespan=lifespan)
 GITHUB_REPO = os.getenv("GITHUB_REPO", "YOUR_ORG/YOUR_REPO")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
@@ -22,55 +34,63 @@ AGENT_CARD = {
     ]
 }
 
-def github_search_code(query):
+async def github_search_code(query):
     headers = {
         "Authorization": f"token {GITHUB_TOKEN}",
         "Accept": "application/vnd.github.v3.text-match+json"
     }
     # Search term should be endpoint path or fragment
-    resp = requests.get(
-        f"https://api.github.com/search/code?q={query}+repo:{GITHUB_REPO}", headers=headers)
-    if resp.ok:
-        return resp.json()
-    else:
-        logging.error(f"GitHub search failed for {query}: {resp.text}")
+    try:
+        async with HTTP["session"].get(
+                "https://api.github.com/search/code",
+                params={"q": f"{query} repo:{GITHUB_REPO}"}, headers=headers) as resp:
+            if resp.ok:
+                return await resp.json()
+            logging.error(f"GitHub search failed for {query}: {await resp.text()}")
+            return {}
+    except Exception as e:
+        logging.error(f"GitHub search failed for {query}: {e}")
         return {}
 
-@app.route("/.well-known/agent-card.json")
+async def analyze_url(url, sem):
+    endpoint = url.split("/", 3)[-1]  # crude path extraction
+    async with sem:
+        search = await github_search_code(endpoint)
+    items = search.get("items", [])
+    mapped = [{
+        "file_path": i["path"],
+        "repo_url": i["html_url"],
+        "snippet": next((tm["fragment"] for tm in i.get("text_matches", [])), None)
+    } for i in items]
+    return {
+        "url": url,
+        "matches": mapped
+    }
+
+@app.get("/.well-known/agent-card.json")
 def agent_card():
-    return jsonify(AGENT_CARD)
+    return AGENT_CARD
 
-@app.route("/v1/message:send", methods=["POST"])
-def message_send():
-    req = request.json
+@app.post("/v1/message:send")
+async def message_send(request: Request):
+    req = await request.json()
     params = req.get("params", {})
     skill = params.get("skill")
     if skill == "discover_fix":
         urls = params.get("failing_urls", [])
-        analysis = []
-        for url in urls:
-            endpoint = url.split("/", 3)[-1]  # crude path extraction
-            search = github_search_code(endpoint)
-            items = search.get("items", [])
-            mapped = [{
-                "file_path": i["path"],
-                "repo_url": i["html_url"],
-                "snippet": next((tm["fragment"] for tm in i.get("text_matches", [])), None)
-            } for i in items]
-            analysis.append({
-                "url": url,
-                "matches": mapped
-            })
-        return jsonify({
+        sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+        analysis = await asyncio.gather(*(analyze_url(url, sem) for url in urls))
+        return {
             "jsonrpc": req.get("jsonrpc", "2.0"),
             "id": req.get("id"),
             "result": {"analysis": analysis}
-        })
-    return jsonify({
+        }
+    return {
         "jsonrpc": req.get("jsonrpc", "2.0"),
         "id": req.get("id"),
         "error": {"code": -32000, "message": "Unknown skill"}
-    })
+    }
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=9200)
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=9200)
@@ -1,9 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-import requests
-import threading
+import aiohttp
+import asyncio
 import time
+from config import MCP_CRAWL_TIMEOUT_SECONDS
 
-app = FastAPI()
+HTTP = {"session": None}
+CRAWL_TASKS = set()
+
+@asynccontextmanager
+async def lifespan(app):
+    HTTP["session"] = aiohttp.ClientSession()
+    yield
+    for task in CRAWL_TASKS:
+        task.cancel()
+    await HTTP["session"].close()
+
+app = FastAPI(lifespan=lifespan)
 
 AGENT_STATE = {
     "last_crawl": None,
@@ -11,17 +24,22 @@ AGENT_STATE = {
     "suggestions": None
 }
 MCP_SERVER_URL = "http://localhost:8080"
+# A full crawl can take a long time; aiohttp's 5 minute default would cut it off
+MCP_CRAWL_TIMEOUT = aiohttp.ClientTimeout(total=MCP_CRAWL_TIMEOUT_SECONDS)
 
-def call_mcp_crawler(target_url, max_concurrent=10, output_prefix="agent_result"):
+async def call_mcp_crawler(target_url, max_concurrent=10, output_prefix="agent_result"):
     payload = {
         "target_url": target_url,
         "max_concurrent": max_concurrent,
         "output_format": "json",
         "output_prefix": output_prefix
     }
-    resp = requests.post(f"{MCP_SERVER_URL}/invoke", json=payload)
-    if resp.ok:
-        return resp.json()
+    try:
+        async with HTTP["session"].post(f"{MCP_SERVER_URL}/invoke", json=payload, timeout=MCP_CRAWL_TIMEOUT) as resp:
+            if resp.ok:
+                return await resp.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
     return None
 
 def generate_suggestions(non200):
@@ -37,9 +55,9 @@ def generate_suggestions(non200):
             suggestions.append(f"Review non-200 status {status}: {uri}")
     return suggestions
 
-def periodic_crawl(interval, target_url, max_concurrent):
+async def periodic_crawl(interval, target_url, max_concurrent):
     while True:
-        result = call_mcp_crawler(target_url, max_concurrent)
+        result = await call_mcp_crawler(target_url, max_concurrent)
         if result:
             AGENT_STATE["last_crawl"] = result
             AGENT_STATE["last_timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -47,7 +65,7 @@ def periodic_crawl(interval, target_url, max_concurrent):
             print(f"[Agent] Periodic crawl complete at {AGENT_STATE['last_timestamp']}.")
         else:
             print("[Agent] MCP crawl failed!")
-        time.sleep(interval)
+        await asyncio.sleep(interval)
 
 AGENT_CARD = {
     "agent_name": "SiteCrawlerA2A",
@@ -70,7 +88,9 @@ async def act(request: Request):
         interval = int(params.get("interval_seconds", 3600))
         target_url = params.get("target_url")
         maxc = int(params.get("max_concurrent", 10))
-        threading.Thread(target=periodic_crawl, args=(interval, target_url, maxc), daemon=True).start()
+        task = asyncio.create_task(periodic_crawl(interval, target_url, maxc))
+        CRAWL_TASKS.add(task)
+        task.add_done_callback(CRAWL_TASKS.discard)
         return {"status": "Started periodic crawl"}
     elif skill == "get_last_report":
         return {
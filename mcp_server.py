@@ -4,10 +4,20 @@ from flask import Flask, request, send_from_directory, jsonify, abort
 import os
 import subprocess
 import json
+from cache import ResultCache
+from report import write_csv, write_json
 
 app = Flask(__name__)
 
 RESULTS_DIR = os.path.abspath("results")  # Ensure results/ is always used
+RUNS_DIR = os.path.join(RESULTS_DIR, "runs")
+# Shared by every client of this tool: identical crawl requests within the TTL
+# are served from cache, and concurrent ones attach to the crawl in progress.
+RESULT_CACHE = ResultCache(
+    os.getenv("MCP_CACHE_DIR", os.path.join("results", "cache")),
+    ttl=int(os.getenv("MCP_CACHE_TTL", "600")),
+    max_entries=int(os.getenv("MCP_CACHE_MAX_ENTRIES", "64"))
+)
 
 MCP_DESCRIPTION = {
     "name": "web_crawler_cli",
@@ -16,11 +26,14 @@ MCP_DESCRIPTION = {
         "target_url": {"type": "string", "description": "Base URL to crawl"},
         "max_concurrent": {"type": "integer", "description": "Maximum concurrent requests"},
         "output_format": {"type": "string", "enum": ["csv", "json"], "description": "csv or json"},
-        "output_prefix": {"type": "string", "description": "Prefix for output files (without folder, e.g. 'a2a_mcp')"}
+        "output_prefix": {"type": "string", "description": "Prefix for output files (without folder, e.g. 'a2a_mcp')"},
+        "check_external": {"type": "boolean", "description": "Also check each unique external link once"}
     },
     "outputs": {
         "http_200": {"type": "list", "description": "List of HTTP 200 records"},
-        "http_non200": {"type": "list", "description": "List of HTTP non-200 (not 3xx) records"}
+        "http_non200": {"type": "list", "description": "List of HTTP non-200 (not 3xx) records"},
+        "external": {"type": "list", "description": "External link records (only when check_external is set)"},
+        "cached": {"type": "boolean", "description": "True if served from the shared result cache or a concurrent identical crawl"}
     }
 }
 
@@ -35,26 +48,54 @@ def invoke_mcp():
     max_concurrent = str(body.get("max_concurrent", 10))
     output_format = body.get("output_format", "json")
     output_prefix = body.get("output_prefix", "a2a_mcp")
+    check_external = bool(body.get("check_external", False))
     # Always store the results in the results/ subdirectory
     full_prefix = os.path.join("results", output_prefix)
-    # Ensure results/ directory exists
-    os.makedirs("results", exist_ok=True)
+    # Ensure results/ and results/runs/ exist
+    os.makedirs(RUNS_DIR, exist_ok=True)
 
-    cmd = [
-        "python", "cli.py",
-        "--target-url", target_url,
-        "--max-concurrent", max_concurrent,
-        "--output-format", output_format,
-        "--output-prefix", full_prefix
-    ]
-    subprocess.run(cmd, check=True)
-    http_200_path = os.path.join("results", f"{output_prefix}_http200.json")
-    http_non200_path = os.path.join("results", f"{output_prefix}_http_non200.json")
-    with open(http_200_path, "r") as f:
-        http_200 = json.load(f)
-    with open(http_non200_path, "r") as f:
-        http_non200 = json.load(f)
-    return jsonify({"http_200": http_200, "http_non200": http_non200})
+    # Output prefix/format only affect file names, so they are not part of the key
+    cache_params = {
+        "target_url": target_url,
+        "max_concurrent": int(max_concurrent),
+        "check_external": check_external
+    }
+    # Crawls write to a prefix owned by their cache key, so concurrent crawls of
+    # different targets can never read each other's files. Single-flight
+    # guarantees only one crawl per key is writing at a time.
+    run_prefix = os.path.join(RUNS_DIR, RESULT_CACHE.make_key(cache_params))
+
+    def run_crawl():
+        cmd = [
+            "python", "cli.py",
+            "--target-url", target_url,
+            "--max-concurrent", max_concurrent,
+            "--output-format", "json",
+            "--output-prefix", run_prefix
+        ]
+        if check_external:
+            cmd.append("--check-external")
+        subprocess.run(cmd, check=True)
+        with open(f"{run_prefix}_http200.json", "r") as f:
+            http_200 = json.load(f)
+        with open(f"{run_prefix}_http_non200.json", "r") as f:
+            http_non200 = json.load(f)
+        result = {"http_200": http_200, "http_non200": http_non200}
+        if check_external:
+            with open(f"{run_prefix}_external.json", "r") as f:
+                result["external"] = json.load(f)
+        return result
+
+    result, cached = RESULT_CACHE.get_or_compute(cache_params, run_crawl)
+    # Give this caller its own copy of the result files in the format it asked for
+    writer = write_csv if output_format == "csv" else write_json
+    ext = "csv" if output_format == "csv" else "json"
+    writer(result["http_200"], f"{full_prefix}_http200.{ext}")
+    writer(result["http_non200"], f"{full_prefix}_http_non200.{ext}")
+    if check_external:
+        writer(result["external"], f"{full_prefix}_external.{ext}")
+    result = dict(result, cached=cached)
+    return jsonify(result)
 
 @app.route("/files/<path:filename>")
 def get_file(filename):
@@ -1,5 +1,6 @@
 import csv
 import json
+import os
 
 def split_by_status(status_dict):
     http200 = []
@@ -12,6 +13,18 @@ def split_by_status(status_dict):
             non200.append({"uri": uri, "status": status})
     return http200, non200
 
+def find_reports(outprefix, name):
+    # --output-format may change between runs, so look for both; newest first
+    paths = [f"{outprefix}_{name}.{ext}" for ext in ("csv", "json")]
+    return sorted((p for p in paths if os.path.isfile(p)), key=os.path.getmtime, reverse=True)
+
+def read_records(path):
+    # Reads back a report written by write_csv/write_json
+    with open(path, "r", encoding="utf-8", newline='') as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        return list(csv.DictReader(f))
+
 def write_csv(records, path):
     with open(path, "w", encoding="utf-8", newline='') as f:
         writer = csv.DictWriter(f, fieldnames=["uri", "status"])
@@ -39,3 +52,30 @@ def report_output(http200, non200, output_format, outprefix, click_echo):
         click_echo(f"HTTP non-200 JSON: {json_non200}", fg="green")
     else:
         click_echo("Unknown output format", fg="red")
+
+def external_report_output(external_status, output_format, outprefix, click_echo):
+    records = [{"uri": uri, "status": status} for uri, status in sorted(external_status.items())]
+    if output_format == "csv":
+        path = f"{outprefix}_external.csv"
+        write_csv(records, path)
+        click_echo(f"External links CSV: {path}", fg="green")
+    elif output_format == "json":
+        path = f"{outprefix}_external.json"
+        write_json(records, path)
+        click_echo(f"External links JSON: {path}", fg="green")
+    else:
+        click_echo("Unknown output format", fg="red")
+
+def recheck_output(records, output_format, outprefix, click_echo):
+    # Replaced on every run (in either format), so failures drop out once rechecked
+    for path in find_reports(outprefix, "recheck"):
+        os.remove(path)
+    if not records:
+        return
+    if output_format == "csv":
+        path = f"{outprefix}_recheck.csv"
+        write_csv(records, path)
+    else:
+        path = f"{outprefix}_recheck.json"
+        write_json(records, path)
+    click_echo(f"Unchecked previous failures ({len(records)}): {path}", fg="yellow")
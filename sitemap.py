@@ -3,25 +3,29 @@ import asyncio
 import aiohttp
 import re
 import csv
+import io
+from collections import deque
 from urllib.parse import urljoin, urlparse
+from xml.sax.saxutils import quoteattr
 import networkx as nx
 
 TARGET_URL = "https://nebius.com/"
 DOMAIN = urlparse(TARGET_URL).netloc
 MAX_CONCURRENT = 10
+MARKDOWN_MAX_NEST = 20
 
-async def get_links_from_html(html, base_url, visited):
+async def get_links_from_html(html, base_url):
     links = set()
     for match in re.findall(r'<a\s[^>]*href=["\'](.*?)["\']', html, re.IGNORECASE):
         href = match.strip()
         full_url = urljoin(base_url, href.split('#')[0])
         parsed = urlparse(full_url)
-        if parsed.netloc == DOMAIN and full_url not in visited:
+        if parsed.netloc == DOMAIN:
             links.add(full_url)
     print(f"[DEBUG] Found {len(links)} internal links on {base_url}")
     return list(links)
 
-async def fetch(session, url, visited):
+async def fetch(session, url):
     try:
         async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
             status = response.status
@@ -30,7 +34,7 @@ async def fetch(session, url, visited):
                 print(f"[WARN] Skipped {url}, status {status}")
                 return url, status, []
             html = await response.text()
-            links = await get_links_from_html(html, url, visited)
+            links = await get_links_from_html(html, url)
             return url, status, links
     except Exception as e:
         print(f"[ERROR] Error accessing {url}: {e}")
@@ -50,7 +54,7 @@ async def crawl_site(start_url):
                     print(f"[DEBUG] Already visited {url}, skip.")
                     return []
                 visited.add(url)
-                url, status, links = await fetch(session, url, visited)
+                url, status, links = await fetch(session, url)
                 status_dict[url] = status
                 link_graph.add_node(url)
                 for link in links:
@@ -96,23 +100,105 @@ def csv_status_table(status_dict):
         rows.append((uri, status, label))
     return rows
 
-def markdown_graph(graph):
-    text = "# Sitemap\n\n"
-    roots = [TARGET_URL]
-    def dfs(node, indent):
-        text_lines = []
-        text_lines.append(" " * indent + f"* [{node}]({node})")
-        children = list(graph.successors(node))
-        for child in children:
-            text_lines.extend(dfs(child, indent + 2))
-        return text_lines
-    already = set()
-    for root in roots:
-        for line in dfs(root, 0):
-            if line not in already:
-                text += line + "\n"
-                already.add(line)
-    return text
+def bfs_tree(graph, root):
+    # Iterative BFS: each page hangs under the parent that reaches it in the fewest clicks
+    if root not in graph:
+        return {}, {}
+    depth, children = {root: 0}, {root: []}
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        for child in graph.successors(node):
+            if child not in depth:
+                depth[child] = depth[node] + 1
+                children[node].append(child)
+                children[child] = []
+                queue.append(child)
+    return depth, children
+
+def graph_stats(graph, root):
+    depth, children = bfs_tree(graph, root)
+    in_degree = dict(graph.in_degree())
+    orphans = [n for n in graph if in_degree[n] == 0 and n != root]
+    # Orphans are unreachable by definition; keep the two sets disjoint
+    unreachable = [n for n in graph if n not in depth and in_degree[n] > 0]
+    return {
+        "depth": depth,
+        "children": children,
+        "in_degree": in_degree,
+        "orphans": orphans,
+        "unreachable": unreachable
+    }
+
+def write_markdown_graph(f, graph, root, stats):
+    f.write("# Sitemap\n\n")
+    depth = stats["depth"]
+    stack = [root] if root in depth else []
+    while stack:
+        node = stack.pop()
+        # Cap nesting so long link chains don't make the output quadratic in size
+        if depth[node] > MARKDOWN_MAX_NEST:
+            f.write(" " * (2 * MARKDOWN_MAX_NEST) + f"* [{node}]({node}) (depth {depth[node]})\n")
+        else:
+            f.write(" " * (2 * depth[node]) + f"* [{node}]({node})\n")
+        stack.extend(reversed(stats["children"][node]))
+    for title, nodes in (("Orphan pages", stats["orphans"]), ("Unreachable pages", stats["unreachable"])):
+        if nodes:
+            f.write(f"\n## {title}\n\n")
+            for node in nodes:
+                f.write(f"* [{node}]({node})\n")
+
+def write_graphml_graph(f, graph, root, stats):
+    depth, in_degree, children = stats["depth"], stats["in_degree"], stats["children"]
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    f.write('  <key id="depth" for="node" attr.name="depth" attr.type="int"/>\n')
+    f.write('  <key id="in_degree" for="node" attr.name="in_degree" attr.type="int"/>\n')
+    f.write('  <key id="tree" for="edge" attr.name="tree" attr.type="boolean"/>\n')
+    f.write('  <graph id="sitemap" edgedefault="directed">\n')
+    for node in graph:
+        f.write(f'    <node id={quoteattr(node)}>')
+        if node in depth:
+            f.write(f'<data key="depth">{depth[node]}</data>')
+        f.write(f'<data key="in_degree">{in_degree[node]}</data></node>\n')
+    tree_edges = {(parent, child) for parent, kids in children.items() for child in kids}
+    for src, dst in graph.edges():
+        tree = "true" if (src, dst) in tree_edges else "false"
+        f.write(f'    <edge source={quoteattr(src)} target={quoteattr(dst)}><data key="tree">{tree}</data></edge>\n')
+    f.write('  </graph>\n</graphml>\n')
+
+def _dot_quote(value):
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def write_dot_graph(f, graph, root, stats):
+    depth, in_degree, children = stats["depth"], stats["in_degree"], stats["children"]
+    f.write("digraph sitemap {\n")
+    for node in graph:
+        node_depth = depth.get(node, "unreachable")
+        f.write(f"  {_dot_quote(node)} [depth={_dot_quote(node_depth)}, in_degree={in_degree[node]}];\n")
+    tree_edges = {(parent, child) for parent, kids in children.items() for child in kids}
+    for src, dst in graph.edges():
+        style = "" if (src, dst) in tree_edges else " [style=dashed]"
+        f.write(f"  {_dot_quote(src)} -> {_dot_quote(dst)}{style};\n")
+    f.write("}\n")
+
+SITEMAP_WRITERS = {
+    "md": write_markdown_graph,
+    "graphml": write_graphml_graph,
+    "dot": write_dot_graph
+}
+
+def export_sitemap(graph, root, output_format, path):
+    # Streams straight to disk; returns the stats so callers can summarise them
+    stats = graph_stats(graph, root)
+    with open(path, "w", encoding="utf-8") as f:
+        SITEMAP_WRITERS[output_format](f, graph, root, stats)
+    return stats
+
+def markdown_graph(graph, root=TARGET_URL):
+    buf = io.StringIO()
+    write_markdown_graph(buf, graph, root, graph_stats(graph, root))
+    return buf.getvalue()
 
 if __name__ == "__main__":
     print("[INFO] Starting Nebius.com async sitemap crawl with debug output.")
@@ -133,8 +219,6 @@ if __name__ == "__main__":
     print("[INFO] Table written to crawler_report.csv")
 
     # Write sitemap graph to sitemap_report.md
-    md_sitemap = markdown_graph(link_graph)
-    with open("sitemap_report.md", "w", encoding="utf-8") as f:
-        f.write(md_sitemap)
+    export_sitemap(link_graph, TARGET_URL, "md", "sitemap_report.md")
     print("[INFO] Sitemap written to sitemap_report.md")
     print("[INFO] Process complete.")
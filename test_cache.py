@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from cache import ResultCache
+
+def test_concurrent_requests_share_one_compute(tmp_path):
+    cache = ResultCache(tmp_path)
+    calls, results = [], []
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"http_200": [], "http_non200": []}
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute({"t": "a"}, compute)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert sorted(cached for _, cached in results) == [False, True, True, True, True]
+    assert cache.get_or_compute({"t": "a"}, compute) == ({"http_200": [], "http_non200": []}, True)
+
+def test_failed_cache_write_releases_waiters(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    def broken_put(key, params, result):
+        raise OSError("disk full")
+    monkeypatch.setattr(cache, "_put", broken_put)
+    started = threading.Event()
+    def compute():
+        started.set()
+        time.sleep(0.2)
+        return {"ok": True}
+    waiter_results = []
+    owner = threading.Thread(target=lambda: cache.get_or_compute({"t": "a"}, compute))
+    owner.start()
+    started.wait()
+    waiter = threading.Thread(target=lambda: waiter_results.append(cache.get_or_compute({"t": "a"}, compute)))
+    waiter.start()
+    owner.join(2)
+    waiter.join(2)
+    assert not waiter.is_alive()
+    assert waiter_results == [({"ok": True}, True)]
+    assert cache.get({"t": "a"}) is None
+
+def test_failed_compute_propagates_to_waiters(tmp_path):
+    cache = ResultCache(tmp_path)
+    started = threading.Event()
+    def compute():
+        started.set()
+        time.sleep(0.2)
+        raise RuntimeError("crawl failed")
+    errors = []
+    def call():
+        try:
+            cache.get_or_compute({"t": "a"}, compute)
+        except RuntimeError as e:
+            errors.append(str(e))
+    owner = threading.Thread(target=call)
+    owner.start()
+    started.wait()
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    owner.join(2)
+    waiter.join(2)
+    assert errors == ["crawl failed", "crawl failed"]
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute({"t": "a"}, compute)
+
+def test_ttl_and_lru_eviction(tmp_path):
+    cache = ResultCache(tmp_path, ttl=0.2, max_entries=2)
+    for name in ("a", "b"):
+        cache.get_or_compute({"t": name}, lambda: {"t": name})
+    cache.get({"t": "a"})  # "b" becomes least recently used
+    cache.get_or_compute({"t": "c"}, lambda: {"t": "c"})
+    assert cache.get({"t": "b"}) is None
+    assert cache.get({"t": "a"}) == {"t": "a"}
+    assert len(ResultCache(tmp_path, ttl=0.2, max_entries=2)._index) == 2
+    time.sleep(0.3)
+    assert cache.get({"t": "c"}) is None
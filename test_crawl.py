@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("networkx")
+from aiohttp import web
+from aiohttp.test_utils import unused_port
+
+from config import get_config
+from crawl import Frontier, crawl_site, make_priority
+from report import split_by_status
+
+PAGES = {
+    "/": '<a href="/a">a</a><a href="/b">b</a>',
+    "/a": '<a href="/c">c</a>',
+    "/b": '<a href="/">home</a>',
+    "/c": "",
+}
+
+def echo(*args, **kwargs):
+    pass
+
+async def run_crawl(**overrides):
+    async def handler(request):
+        if request.path not in PAGES:
+            return web.Response(status=404)
+        return web.Response(text=PAGES[request.path], content_type="text/html")
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    port = unused_port()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    base = f"http://127.0.0.1:{port}"
+    try:
+        config = get_config(dict({"target_url": f"{base}/"}, **overrides))
+        config["failed_urls"] = [f"{base}{path}" for path in config["failed_urls"]]
+        return base, await crawl_site(config, echo)
+    finally:
+        await runner.cleanup()
+
+def test_unlinked_previous_failure_is_not_reported():
+    base, (status_dict, link_graph, _, unlinked_status) = asyncio.run(run_crawl(failed_urls=["/gone"]))
+    http200, non200 = split_by_status(status_dict)
+    assert non200 == []
+    assert len(http200) == 4
+    assert unlinked_status == {f"{base}/gone": 404}
+    assert f"{base}/gone" not in link_graph
+
+def test_budgeted_crawl_keeps_reporting_previous_failures():
+    base, (status_dict, _, _, unlinked_status) = asyncio.run(run_crawl(failed_urls=["/gone"], max_pages=1))
+    assert status_dict == {f"{base}/gone": 404}
+    assert unlinked_status == {}
+
+def test_frontier_pops_failures_then_weighted_depth_then_in_degree():
+    frontier = Frontier(make_priority(["https://x/deep/fail"], {"/docs": 2}))
+    frontier.push("https://x/", 0, linked=False)
+    frontier.push("https://x/deep/fail", float("inf"), linked=False)
+    frontier.push("https://x/a", 1)
+    frontier.push("https://x/b", 1)
+    frontier.push("https://x/b", 1)
+    frontier.push("https://x/docs/p", 2)
+    order = [frontier.pop() for _ in range(len(frontier))]
+    assert order == [
+        "https://x/deep/fail",  # failed last run
+        "https://x/docs/p",     # depth 2 minus weight 2, one inbound link
+        "https://x/",           # depth 0, no inbound links
+        "https://x/b",          # depth 1, two inbound links
+        "https://x/a",          # depth 1, one inbound link
+    ]
+
+def test_frontier_skips_stale_entries():
+    frontier = Frontier(make_priority())
+    frontier.push("https://x/a", 5)
+    frontier.push("https://x/a", 2)
+    frontier.push("https://x/b", 3)
+    assert len(frontier) == 2
+    assert frontier.pop() == "https://x/a"
+    frontier.push("https://x/a", 1)  # already popped: ignored
+    assert frontier.pop() == "https://x/b"
+    assert len(frontier) == 0
+    with pytest.raises(IndexError):
+        frontier.pop()
+
+@pytest.mark.parametrize("max_pages", [1, 2, 3])
+def test_max_pages_stops_at_exactly_n_fetches(max_pages):
+    _, (status_dict, _, _, _) = asyncio.run(run_crawl(max_pages=max_pages))
+    assert len(status_dict) == max_pages
@@ -0,0 +1,26 @@
+import os
+
+from report import find_reports, read_records, recheck_output, write_csv, write_json
+
+def echo(*args, **kwargs):
+    pass
+
+def test_recheck_file_replaced_across_formats_and_removed_when_empty(tmp_path):
+    prefix = str(tmp_path / "run")
+    records = [{"uri": "https://example.com/gone", "status": 404}]
+    recheck_output(records, "csv", prefix, echo)
+    assert find_reports(prefix, "recheck") == [f"{prefix}_recheck.csv"]
+    recheck_output(records, "json", prefix, echo)
+    assert find_reports(prefix, "recheck") == [f"{prefix}_recheck.json"]
+    assert read_records(f"{prefix}_recheck.json") == records
+    recheck_output([], "json", prefix, echo)
+    assert find_reports(prefix, "recheck") == []
+
+def test_find_reports_prefers_newest_format(tmp_path):
+    prefix = str(tmp_path / "run")
+    write_json([{"uri": "a", "status": 404}], f"{prefix}_http_non200.json")
+    write_csv([{"uri": "b", "status": 500}], f"{prefix}_http_non200.csv")
+    os.utime(f"{prefix}_http_non200.json", (1, 1))
+    newest = find_reports(prefix, "http_non200")[0]
+    assert newest == f"{prefix}_http_non200.csv"
+    assert read_records(newest) == [{"uri": "b", "status": "500"}]